@@ -8,24 +8,17 @@ The British file uses the same column names as the US file for common blocs,
 with ancient empire columns (Roman Empire, etc.) added at the end.
 """
 
-import csv
 from pathlib import Path
 
+import pandas as pd
+
 def load_csv_data(filepath):
-    """Load CSV data into a list of dictionaries."""
-    data = []
-    with open(filepath, 'r') as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        for row in reader:
-            # Convert year to int and other values to float
-            processed_row = {'Year': int(row['Year'])}
-            for key in headers:
-                if key != 'Year':
-                    value = row[key].strip()
-                    processed_row[key] = float(value) if value else 0.0
-            data.append(processed_row)
-    return data, headers
+    """Load CSV data into a DataFrame with integer years and float values."""
+    df = pd.read_csv(filepath, skipinitialspace=True)
+    value_columns = [col for col in df.columns if col != 'Year']
+    df[value_columns] = df[value_columns].astype(float).fillna(0.0)
+    df['Year'] = df['Year'].astype(int)
+    return df
 
 def main():
     # Define paths
@@ -35,66 +28,38 @@ def main():
     output_path = script_dir / 'world_power.csv'
 
     print(f"Loading British data from: {british_path}")
-    british_data, british_headers = load_csv_data(british_path)
+    british = load_csv_data(british_path)
 
     print(f"Loading US data from: {us_path}")
-    us_data, us_headers = load_csv_data(us_path)
-
-    # Create a mapping of US year -> row data
-    us_data_by_year = {row['Year']: row for row in us_data}
+    us = load_csv_data(us_path)
 
     # Determine the overlap range
-    us_years = set(us_data_by_year.keys())
-    british_years = {row['Year'] for row in british_data}
-    overlap_years = us_years & british_years
+    overlap = british['Year'].isin(us['Year'])
+    overlap_years = british.loc[overlap, 'Year']
 
-    print(f"\nOverlap years: {min(overlap_years)} to {max(overlap_years)}")
+    print(f"\nOverlap years: {overlap_years.min()} to {overlap_years.max()}")
     print(f"Total overlapping years: {len(overlap_years)}")
 
-    # Build merged data structure
     # The British file now uses the same column names as US for common blocs
     # Ancient empire columns are at the end and only have values for pre-1750 years
-    merged_data = []
-
-    # Ancient empire columns (only in British data, appended after common columns)
     # Note: "Independent Indian States" was merged into "India" for simplicity
-    ancient_columns = ['Roman Empire', 'Parthian/Sassanid Empire', 'Byzantine Empire',
-                       'Islamic Caliphate', 'Mongol Empire']
-
-    for british_row in british_data:
-        year = british_row['Year']
-
-        if year in us_data_by_year:
-            # Use US data for this year
-            us_row = us_data_by_year[year]
-
-            # Start with zeros for all columns
-            merged_row = {'Year': year}
-            for col in british_headers:
-                if col != 'Year':
-                    merged_row[col] = 0.0
-
-            # Copy US data directly (column names now match)
-            for col in us_headers:
-                if col != 'Year' and col in merged_row:
-                    merged_row[col] = us_row[col]
-
-            print(f"Year {year}: Using US data")
-        else:
-            # Keep original British data for years before US data starts
-            merged_row = british_row.copy()
-            print(f"Year {year}: Using British data")
-
-        merged_data.append(merged_row)
+    british_columns = [col for col in british.columns if col != 'Year']
+    common_columns = [col for col in us.columns if col != 'Year' and col in british_columns]
+
+    # Use US data for overlapping years: zero every bloc, then copy the US
+    # columns across (column names now match). Earlier years keep British data.
+    merged = british.copy()
+    merged.loc[overlap, british_columns] = 0.0
+    merged.loc[overlap, common_columns] = (
+        us.set_index('Year').loc[overlap_years, common_columns].to_numpy()
+    )
+    print(f"Merged {overlap.sum()} years from US, {(~overlap).sum()} years from British-only")
 
     # Write merged data
     print(f"\nWriting merged data to: {output_path}")
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=british_headers)
-        writer.writeheader()
-        writer.writerows(merged_data)
+    merged.to_csv(output_path, index=False, lineterminator='\r\n')
 
-    print(f"Successfully wrote {len(merged_data)} rows to {output_path}")
+    print(f"Successfully wrote {len(merged)} rows to {output_path}")
     print("\nMerge complete!")
 
 if __name__ == '__main__':
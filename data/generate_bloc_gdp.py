@@ -7,271 +7,211 @@ Generate historical power bloc GDP dataset by merging:
 Output: power_bloc_gdp_by_decade.csv with GDP data by country/bloc/decade
 """
 
-import csv
-from collections import defaultdict
-import math
+import numpy as np
+import pandas as pd
 
 # Decades to generate (1750, 1760, ... 2020)
 DECADES = list(range(1750, 2030, 10))
+DECADES_ARRAY = np.array(DECADES)
 
 def load_bloc_assignments(filepath):
-    """Load bloc assignments from CSV into dictionary."""
-    assignments = defaultdict(list)
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            country_code = row['countrycode']
-            assignments[country_code].append({
-                'start_year': int(row['start_year']),
-                'end_year': int(row['end_year']),
-                'bloc': row['bloc'],
-                'percentage': float(row['percentage'])
-            })
+    """Load bloc assignments from CSV into a dictionary of per-country arrays.
+
+    Each country maps to parallel (start_years, end_years, blocs, percentages)
+    arrays, in file order.
+    """
+    df = pd.read_csv(filepath, encoding='utf-8',
+                     usecols=['countrycode', 'start_year', 'end_year', 'bloc', 'percentage'],
+                     dtype={'start_year': int, 'end_year': int, 'percentage': float})
+    assignments = {}
+    for country_code, group in df.groupby('countrycode', sort=False):
+        assignments[country_code] = (
+            group['start_year'].to_numpy(),
+            group['end_year'].to_numpy(),
+            group['bloc'].to_numpy(),
+            group['percentage'].to_numpy(),
+        )
     return assignments
 
 def load_gdp_data(filepath):
-    """Load Madison GDP data into dictionary."""
-    gdp_data = defaultdict(list)
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            country_code = row['countrycode']
-            try:
-                year = int(row['year'])
-                gdppc = float(row['gdppc'].replace(',', '')) if row['gdppc'] else None
-                pop = float(row['pop'].replace(',', '')) if row['pop'] else None
-
-                if gdppc is not None and pop is not None:
-                    gdp_data[country_code].append({
-                        'year': year,
-                        'gdppc': gdppc,
-                        'pop': pop
-                    })
-            except (ValueError, KeyError):
-                continue
-
-    # Sort by year for each country
-    for country_code in gdp_data:
-        gdp_data[country_code].sort(key=lambda x: x['year'])
-
-    return gdp_data
-
-def get_country_name(filepath, country_code):
-    """Get country name from Madison dataset."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row['countrycode'] == country_code:
-                return row['country']
-    return country_code
-
-def interpolate_gdp(gdp_data, year):
-    """Interpolate GDP data for a specific year."""
-    if not gdp_data:
-        return None, None
-
-    # Find exact match
-    for entry in gdp_data:
-        if entry['year'] == year:
-            return entry['gdppc'], entry['pop']
-
-    # Find surrounding years for interpolation
-    before = [e for e in gdp_data if e['year'] < year]
-    after = [e for e in gdp_data if e['year'] > year]
-
-    if before and after:
-        # Linear interpolation
-        y1_data = before[-1]  # closest before
-        y2_data = after[0]     # closest after
-
-        y1, y2 = y1_data['year'], y2_data['year']
-        gdppc1, gdppc2 = y1_data['gdppc'], y2_data['gdppc']
-        pop1, pop2 = y1_data['pop'], y2_data['pop']
-
-        # Linear interpolation
-        ratio = (year - y1) / (y2 - y1)
-        gdppc = gdppc1 + (gdppc2 - gdppc1) * ratio
-        pop = pop1 + (pop2 - pop1) * ratio
-
+    """Load Madison GDP data and country names into dictionaries.
+
+    GDP data maps each country to parallel (years, gdppc, pop) arrays sorted
+    by year, keeping only years where both gdppc and pop are known.
+    """
+    df = pd.read_csv(filepath, encoding='utf-8',
+                     usecols=['countrycode', 'country', 'year', 'gdppc', 'pop'],
+                     thousands=',', dtype={'year': int, 'gdppc': float, 'pop': float})
+
+    country_names = dict(df.drop_duplicates('countrycode')[['countrycode', 'country']]
+                         .itertuples(index=False))
+
+    df = df.dropna(subset=['gdppc', 'pop']).sort_values(['countrycode', 'year'], kind='stable')
+    gdp_data = {
+        country_code: (group['year'].to_numpy(),
+                       group['gdppc'].to_numpy(),
+                       group['pop'].to_numpy())
+        for country_code, group in df.groupby('countrycode', sort=False)
+    }
+
+    return gdp_data, country_names
+
+def interpolate_all_decades(country_gdp, decades):
+    """Interpolate GDP data for every decade at once.
+
+    Returns gdppc and pop arrays aligned with decades, with NaN wherever no
+    estimate is available.
+    """
+    gdppc = np.full(len(decades), np.nan)
+    pop = np.full(len(decades), np.nan)
+    if country_gdp is None:
         return gdppc, pop
 
-    elif before and not after:
-        # Extrapolate forward - only allow 20 years max
-        years_ahead = year - before[-1]['year']
-        if years_ahead > 20:
-            return None, None
-
-        if len(before) >= 2:
-            recent = before[-2:]
-            years_diff = recent[1]['year'] - recent[0]['year']
-            gdppc_growth = (recent[1]['gdppc'] / recent[0]['gdppc']) ** (1 / years_diff)
-            pop_growth = (recent[1]['pop'] / recent[0]['pop']) ** (1 / years_diff)
-
-            gdppc = recent[1]['gdppc'] * (gdppc_growth ** years_ahead)
-            pop = recent[1]['pop'] * (pop_growth ** years_ahead)
-
-            return gdppc, pop
-        else:
-            # Only one point, just use it if within 10 years
-            if years_ahead <= 10:
-                return before[0]['gdppc'], before[0]['pop']
-            return None, None
-
-    elif not before and after:
-        # Extrapolate backward - be conservative but allow further back for estimates
-        years_back = after[0]['year'] - year
-
-        # Use 20 year limit by default, but allow up to 70 years for better estimation
-        max_years_back = 20
-        if len(after) >= 3:
-            max_years_back = 70  # Allow more if we have 3+ points for better trend
-
-        if years_back > max_years_back:
-            return None, None
-
-        if len(after) >= 3:
-            # Use first 3 points for more robust growth estimation
-            early = after[:3]
-            # Calculate average annual growth rate across the 3 points
-            total_years = early[2]['year'] - early[0]['year']
-            gdppc_total_growth = (early[2]['gdppc'] / early[0]['gdppc']) ** (1 / total_years)
-            pop_total_growth = (early[2]['pop'] / early[0]['pop']) ** (1 / total_years)
-
-            # Calculate backwards extrapolation
-            gdppc_back = early[0]['gdppc'] / (gdppc_total_growth ** years_back)
-            pop_back = early[0]['pop'] / (pop_total_growth ** years_back)
-
-            # NEVER allow GDP per capita to be higher going backwards
-            if gdppc_back > early[0]['gdppc']:
-                return None, None
-
-            return gdppc_back, pop_back
-        elif len(after) >= 2:
-            early = after[:2]
-            years_diff = early[1]['year'] - early[0]['year']
-            gdppc_growth = (early[1]['gdppc'] / early[0]['gdppc']) ** (1 / years_diff)
-            pop_growth = (early[1]['pop'] / early[0]['pop']) ** (1 / years_diff)
-
-            # Calculate backwards extrapolation
-            gdppc_back = early[0]['gdppc'] / (gdppc_growth ** years_back)
-            pop_back = early[0]['pop'] / (pop_growth ** years_back)
-
-            # NEVER allow GDP per capita to be higher going backwards
-            if gdppc_back > early[0]['gdppc']:
-                return None, None
-
-            return gdppc_back, pop_back
-        else:
-            # Only one point, just use it if within 10 years
-            if years_back <= 10:
-                return after[0]['gdppc'], after[0]['pop']
-            return None, None
-
-    return None, None
-
-def get_bloc_for_year(assignments, year):
-    """Get bloc assignment(s) for a specific year."""
-    blocs = []
-    for assignment in assignments:
-        if assignment['start_year'] <= year <= assignment['end_year']:
-            blocs.append({
-                'bloc': assignment['bloc'],
-                'percentage': assignment['percentage']
-            })
-    return blocs
+    years, gdppc_series, pop_series = country_gdp
+
+    # Linear interpolation (or exact match) for decades inside the data range
+    ahead = decades > years[-1]
+    back = decades < years[0]
+    in_range = ~(ahead | back)
+    gdppc[in_range] = np.interp(decades[in_range], years, gdppc_series)
+    pop[in_range] = np.interp(decades[in_range], years, pop_series)
+
+    # Extrapolate the (rare) decades outside it
+    if ahead.any():
+        gdppc[ahead], pop[ahead] = extrapolate_forward(
+            years, gdppc_series, pop_series, decades[ahead])
+    if back.any():
+        gdppc[back], pop[back] = extrapolate_backward(
+            years, gdppc_series, pop_series, decades[back])
+
+    return gdppc, pop
+
+def extrapolate_forward(years, gdppc, pop, targets):
+    """Extrapolate GDP data for target years after the country's last data point."""
+    years_ahead = targets - years[-1]
+
+    if len(years) >= 2:
+        # Growth rates are computed once and applied to every target year
+        years_diff = years[-1] - years[-2]
+        gdppc_growth = (gdppc[-1] / gdppc[-2]) ** (1 / years_diff)
+        pop_growth = (pop[-1] / pop[-2]) ** (1 / years_diff)
+
+        gdppc_ahead = gdppc[-1] * (gdppc_growth ** years_ahead)
+        pop_ahead = pop[-1] * (pop_growth ** years_ahead)
+
+        # Only allow 20 years max
+        valid = years_ahead <= 20
+    else:
+        # Only one point, just use it if within 10 years
+        gdppc_ahead = np.full(len(targets), gdppc[-1])
+        pop_ahead = np.full(len(targets), pop[-1])
+        valid = years_ahead <= 10
+
+    return np.where(valid, gdppc_ahead, np.nan), np.where(valid, pop_ahead, np.nan)
+
+def extrapolate_backward(years, gdppc, pop, targets):
+    """Extrapolate GDP data for target years before the country's first data point."""
+    years_back = years[0] - targets
+
+    # Be conservative: use a 20 year limit by default, but allow up to 70 years
+    # if we have 3+ points for a better trend
+    max_years_back = 70 if len(years) >= 3 else 20
+
+    if len(years) >= 2:
+        # Use the first 3 points (if available) for more robust growth
+        # estimation, taking the average annual growth rate across them
+        last = min(len(years), 3) - 1
+        years_diff = years[last] - years[0]
+        gdppc_growth = (gdppc[last] / gdppc[0]) ** (1 / years_diff)
+        pop_growth = (pop[last] / pop[0]) ** (1 / years_diff)
+
+        gdppc_back = gdppc[0] / (gdppc_growth ** years_back)
+        pop_back = pop[0] / (pop_growth ** years_back)
+
+        # NEVER allow GDP per capita to be higher going backwards
+        valid = (years_back <= max_years_back) & (gdppc_back <= gdppc[0])
+    else:
+        # Only one point, just use it if within 10 years
+        gdppc_back = np.full(len(targets), gdppc[0])
+        pop_back = np.full(len(targets), pop[0])
+        valid = years_back <= 10
+
+    return np.where(valid, gdppc_back, np.nan), np.where(valid, pop_back, np.nan)
+
+def get_blocs_for_decades(assignments, decades):
+    """Get a (decades x assignments) mask of which assignments cover each decade."""
+    start_years, end_years, _, _ = assignments
+    return (start_years <= decades[:, None]) & (decades[:, None] <= end_years)
 
 def main():
     print("Loading bloc assignments...")
     bloc_assignments = load_bloc_assignments('country_bloc_periods.csv')
 
     print("Loading Madison GDP data...")
-    gdp_data = load_gdp_data('madison_world_gdp/mpd2020/Full data-Table 1.csv')
-
-    # Get country names
-    print("Loading country names...")
-    country_names = {}
-    with open('madison_world_gdp/mpd2020/Full data-Table 1.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row['countrycode'] not in country_names:
-                country_names[row['countrycode']] = row['country']
-
-    # Generate output rows
+    gdp_data, country_names = load_gdp_data('madison_world_gdp/mpd2020/Full data-Table 1.csv')
+
+    # Generate output rows, collected as parallel columns
     print("Generating decade-by-decade data...")
-    output_rows = []
+    columns = {
+        'countrycode': [],
+        'country': [],
+        'year': [],
+        'bloc': [],
+        'bloc_percentage': [],
+        'gdppc': [],
+        'pop': [],
+    }
 
-    # First pass: collect all data
     for country_code in bloc_assignments.keys():
         country_name = country_names.get(country_code, country_code)
-        country_gdp = gdp_data.get(country_code, [])
-
-        for decade in DECADES:
-            # Get bloc assignment(s) for this decade
-            blocs = get_bloc_for_year(bloc_assignments[country_code], decade)
-
-            if not blocs:
-                continue  # No assignment for this decade
-
-            # Get/interpolate GDP data
-            gdppc, pop = interpolate_gdp(country_gdp, decade)
-
-            if gdppc is None or pop is None:
-                continue  # No GDP data available
-
-            gdp = gdppc * pop
-
-            # Create row(s) for each bloc assignment
-            for bloc_info in blocs:
-                output_rows.append({
-                    'countrycode': country_code,
-                    'country': country_name,
-                    'year': decade,
-                    'bloc': bloc_info['bloc'],
-                    'bloc_percentage': bloc_info['percentage'],
-                    'gdppc': gdppc,
-                    'pop': pop,
-                    'gdp': gdp,
-                    'gdp_percent': None  # Will calculate in second pass
-                })
-
-    # Second pass: calculate world GDP totals per decade and GDP percentages
+        gdppc_by_decade, pop_by_decade = interpolate_all_decades(
+            gdp_data.get(country_code), DECADES_ARRAY)
+
+        # Keep (decade, assignment) pairs that have both a bloc assignment
+        # and GDP data available
+        country_assignments = bloc_assignments[country_code]
+        has_gdp = ~(np.isnan(gdppc_by_decade) | np.isnan(pop_by_decade))
+        active = get_blocs_for_decades(country_assignments, DECADES_ARRAY) & has_gdp[:, None]
+        decade_indices, assignment_indices = np.nonzero(active)
+
+        # Create row(s) for each bloc assignment
+        _, _, blocs, percentages = country_assignments
+        columns['countrycode'].extend([country_code] * len(decade_indices))
+        columns['country'].extend([country_name] * len(decade_indices))
+        columns['year'].extend(DECADES_ARRAY[decade_indices].tolist())
+        columns['bloc'].extend(blocs[assignment_indices].tolist())
+        columns['bloc_percentage'].extend(percentages[assignment_indices].tolist())
+        columns['gdppc'].extend(gdppc_by_decade[decade_indices].tolist())
+        columns['pop'].extend(pop_by_decade[decade_indices].tolist())
+
+    df = pd.DataFrame(columns)
+    # Country codes and blocs repeat across many rows, so store them as categories
+    df['countrycode'] = df['countrycode'].astype('category')
+    df['bloc'] = df['bloc'].astype('category')
+    df['gdp'] = df['gdppc'] * df['pop']
+
+    # Calculate world GDP totals per decade and GDP percentages
     print("Calculating GDP percentages...")
-    world_gdp_by_decade = defaultdict(float)
-
-    for row in output_rows:
-        decade = row['year']
-        # Account for bloc percentage (e.g., Germany split)
-        weighted_gdp = row['gdp'] * (row['bloc_percentage'] / 100.0)
-        world_gdp_by_decade[decade] += weighted_gdp
-
-    # Update GDP percentages
-    for row in output_rows:
-        decade = row['year']
-        world_gdp = world_gdp_by_decade[decade]
-        weighted_gdp = row['gdp'] * (row['bloc_percentage'] / 100.0)
-        row['gdp_percent'] = round((weighted_gdp / world_gdp) * 100, 2)
-
-    # Write output
+    decade_indices = np.searchsorted(DECADES_ARRAY, df['year'].to_numpy())
+    # Account for bloc percentage (e.g., Germany split)
+    weighted_gdp = df['gdp'].to_numpy() * (df['bloc_percentage'].to_numpy() / 100.0)
+    world_gdp_by_decade = np.bincount(decade_indices, weights=weighted_gdp,
+                                      minlength=len(DECADES))
+    df['gdp_percent'] = (weighted_gdp / world_gdp_by_decade[decade_indices]) * 100
+
+    # Round values for output
+    df[['gdppc', 'pop', 'gdp']] = df[['gdppc', 'pop', 'gdp']].round().astype('int64')
+    df[['bloc_percentage', 'gdp_percent']] = df[['bloc_percentage', 'gdp_percent']].round(2)
+
+    # Write output, sorted by country, then year. np.lexsort is stable, so
+    # multiple bloc rows for the same country and decade keep assignment order.
+    # Category codes sort like the country codes since categories are sorted.
     print("Writing output file...")
-    with open('power_bloc_gdp_by_decade.csv', 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['countrycode', 'country', 'year', 'bloc', 'bloc_percentage',
-                     'gdppc', 'pop', 'gdp', 'gdp_percent']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        # Sort by country, then year
-        output_rows.sort(key=lambda x: (x['countrycode'], x['year']))
-
-        # Round values for output
-        for row in output_rows:
-            row['gdppc'] = int(round(row['gdppc']))
-            row['pop'] = int(round(row['pop']))
-            row['gdp'] = int(round(row['gdp']))
-            row['bloc_percentage'] = round(row['bloc_percentage'], 2)
-
-        writer.writerows(output_rows)
+    order = np.lexsort((df['year'].to_numpy(), df['countrycode'].cat.codes.to_numpy()))
+    df = df.iloc[order]
+    df.to_csv('power_bloc_gdp_by_decade.csv', index=False, lineterminator='\r\n')
 
-    print(f"Done! Generated {len(output_rows)} rows across {len(DECADES)} decades")
+    print(f"Done! Generated {len(df)} rows across {len(DECADES)} decades")
     print(f"Output: power_bloc_gdp_by_decade.csv")
 
 if __name__ == '__main__':
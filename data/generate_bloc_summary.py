@@ -6,93 +6,92 @@ Output: A table with decades as rows and blocs as columns,
 showing percentage of world GDP (PPP) for each bloc in each decade.
 """
 
-import csv
-from collections import defaultdict
-
-def main():
-    print("Loading bloc GDP data...")
-
-    # Define empires to consolidate into "Other European Empires"
-    # Keep only British, Russian, Japanese, Ottoman separate as major powers
-    consolidate_to_other_european = {
-        'Spanish Empire',
-        'French Empire',
-        'Portuguese Empire',
-        'Austro-Hungarian Empire',
-        'Dutch Empire',
-        'German Empire',
-        'Belgian Empire',
-        'Italian Empire'
-    }
-
-    # Collect GDP percentages by decade and bloc
-    bloc_gdp = defaultdict(lambda: defaultdict(float))
-    all_blocs = set()
-    all_decades = set()
-
-    with open('power_bloc_gdp_by_decade.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            decade = int(row['year'])
-            bloc = row['bloc']
-            gdp_percent = float(row['gdp_percent'])
-
-            # Consolidate smaller European empires
-            if bloc in consolidate_to_other_european:
-                bloc = 'Other European Empires'
-
-            # Consolidate India variants into single "India"
-            if bloc in ('India - post independence', 'Independent Indian States'):
-                bloc = 'India'
-
-            bloc_gdp[decade][bloc] += gdp_percent
-            all_blocs.add(bloc)
-            all_decades.add(decade)
-
-    # Sort decades chronologically
-    sorted_decades = sorted(all_decades)
-
-    # Define custom bloc order based on succession/inheritance
-    # Stack blocs to maximize adjacency with territory transfer partners
-    # India is placed directly below British Empire to show absorption effect
-    # Other is always at the top (last in list)
-    bloc_order = [
-        'China',
-        'BRICS + Aligned',
-        'Ottoman Empire',
-        'Other European Empires',
-        'NATO + Aligned',
-        'India',
-        'British Empire',
-        'US',
-        'Japanese Empire',
-        'Russian Empire',
-        'USSR + Aligned',
-        'Other'  # Always at top
-    ]
+import pandas as pd
+
+# Rows of power_bloc_gdp_by_decade.csv to read at a time
+CHUNK_SIZE = 200_000
+
+# Define empires to consolidate into "Other European Empires"
+# Keep only British, Russian, Japanese, Ottoman separate as major powers
+CONSOLIDATE_TO_OTHER_EUROPEAN = frozenset({
+    'Spanish Empire',
+    'French Empire',
+    'Portuguese Empire',
+    'Austro-Hungarian Empire',
+    'Dutch Empire',
+    'German Empire',
+    'Belgian Empire',
+    'Italian Empire'
+})
+
+# Rename map for consolidating blocs:
+# smaller European empires, and India variants into single "India"
+CONSOLIDATE = {bloc: 'Other European Empires' for bloc in CONSOLIDATE_TO_OTHER_EUROPEAN}
+CONSOLIDATE['India - post independence'] = 'India'
+CONSOLIDATE['Independent Indian States'] = 'India'
+
+# Define custom bloc order based on succession/inheritance
+# Stack blocs to maximize adjacency with territory transfer partners
+# India is placed directly below British Empire to show absorption effect
+# Other is always at the top (last in list)
+BLOC_ORDER = [
+    'China',
+    'BRICS + Aligned',
+    'Ottoman Empire',
+    'Other European Empires',
+    'NATO + Aligned',
+    'India',
+    'British Empire',
+    'US',
+    'Japanese Empire',
+    'Russian Empire',
+    'USSR + Aligned',
+    'Other'  # Always at top
+]
+
+def build_summary(input_csv, output_csv, consolidate=None, bloc_order=None):
+    """Write a decade x bloc table of world GDP percentages and return it.
+
+    Blocs are renamed via the optional consolidate map before summing, and
+    columns follow bloc_order with any unlisted blocs sorted at the end.
+    """
+    consolidate = consolidate or {}
+    bloc_order = bloc_order or []
+
+    # Sum GDP percentages by decade and bloc, reading the input in chunks so
+    # memory stays bounded by the number of (decade, bloc) pairs
+    totals = None
+    for chunk in pd.read_csv(input_csv, encoding='utf-8',
+                             usecols=['year', 'bloc', 'gdp_percent'],
+                             chunksize=CHUNK_SIZE):
+        if consolidate:
+            # Table lookup; blocs without an entry keep their name
+            chunk['bloc'] = chunk['bloc'].map(consolidate).fillna(chunk['bloc'])
+        chunk_totals = chunk.groupby(['year', 'bloc'])['gdp_percent'].sum()
+        totals = chunk_totals if totals is None else totals.add(chunk_totals, fill_value=0.0)
+
+    # Decades as rows (sorted chronologically) and blocs as columns
+    bloc_gdp = totals.unstack(fill_value=0.0)
 
     # Sort blocs according to custom order, with any unlisted blocs at the end
+    all_blocs = set(bloc_gdp.columns)
     sorted_blocs = [b for b in bloc_order if b in all_blocs]
     sorted_blocs += sorted([b for b in all_blocs if b not in bloc_order])
+    bloc_gdp = bloc_gdp[sorted_blocs]
+    bloc_gdp.index.name = 'Year'
 
-    print(f"Found {len(sorted_blocs)} blocs across {len(sorted_decades)} decades")
+    print(f"Found {len(sorted_blocs)} blocs across {len(bloc_gdp)} decades")
 
     # Write output CSV
     print("Writing bloc summary table...")
-    with open('bloc_gdp_summary.csv', 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
+    bloc_gdp.round(2).to_csv(output_csv, encoding='utf-8', lineterminator='\r\n')
 
-        # Write header
-        header = ['Year'] + sorted_blocs
-        writer.writerow(header)
+    return bloc_gdp
 
-        # Write data rows
-        for decade in sorted_decades:
-            row = [decade]
-            for bloc in sorted_blocs:
-                gdp_pct = bloc_gdp[decade].get(bloc, 0.0)
-                row.append(round(gdp_pct, 2))
-            writer.writerow(row)
+def main():
+    print("Loading bloc GDP data...")
+    bloc_gdp = build_summary('power_bloc_gdp_by_decade.csv', 'bloc_gdp_summary.csv',
+                             consolidate=CONSOLIDATE, bloc_order=BLOC_ORDER)
 
     print("Done!")
     print("Output: bloc_gdp_summary.csv")
@@ -102,17 +101,17 @@ def main():
     print("-" * 80)
 
     # Print header
+    blocs = list(bloc_gdp.columns[:5])  # Show first 5 blocs
     header_str = f"{'Year':<8}"
-    for bloc in sorted_blocs[:5]:  # Show first 5 blocs
+    for bloc in blocs:
         header_str += f"{bloc[:15]:<17}"
     print(header_str + "...")
 
     # Print first 5 decades
-    for decade in sorted_decades[:5]:
+    for decade, row in bloc_gdp.head(5).iterrows():
         row_str = f"{decade:<8}"
-        for bloc in sorted_blocs[:5]:
-            gdp_pct = bloc_gdp[decade].get(bloc, 0.0)
-            row_str += f"{gdp_pct:<17.2f}"
+        for bloc in blocs:
+            row_str += f"{row[bloc]:<17.2f}"
         print(row_str + "...")
 
 if __name__ == '__main__':